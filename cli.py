@@ -1,13 +1,47 @@
 import click
+import json
 import os
+from core.currency import DEFAULT_CURRENCY, format_money
 from services.expense_service import ExpenseService
 from utils import display
-from utils.pdf_export import export_summary_to_pdf
+from utils.export import SECTIONS, export_delimited, export_html
+from utils.report import build_report_context
 import datetime
 
 expense_service = ExpenseService()
 
 
+def _resolve_involved(spec, all_known_people):
+    """Turns "Alice,2,Bob" (or a list) into names; numbers follow list-people order."""
+    items = spec.split(",") if isinstance(spec, str) else spec
+    names = []
+    for item in items:
+        item = str(item).strip()
+        if not item:
+            continue
+        if item.isdigit():
+            index = int(item)
+            if not 1 <= index <= len(all_known_people):
+                raise ValueError(f"Invalid person number: {index}.")
+            names.append(all_known_people[index - 1])
+        else:
+            names.append(item)
+    return names
+
+
+def _parse_split_values(spec):
+    """Parses "Alice=2,Bob=1" into {"Alice": 2.0, "Bob": 1.0}."""
+    values = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid split value '{item.strip()}', expected name=value.")
+        values[name.strip()] = float(value)
+    return values
+
+
 @click.group()
 def cli():
     """"""
@@ -29,20 +63,47 @@ def cli():
     prompt="Who paid for this (enter name)",
     help="Name of the person who paid.",
 )
-def add(desc, amount, paid_by):
+@click.option(
+    "--split",
+    "split_mode",
+    type=click.Choice(["equal", "shares", "percent", "exact"]),
+    help="How to split the expense between the people involved (default: equal).",
+)
+@click.option(
+    "--currency",
+    default=DEFAULT_CURRENCY,
+    show_default=True,
+    help="Currency code of the expense (e.g. INR, USD).",
+)
+@click.option(
+    "--involved",
+    help="Comma-separated names or list-people numbers to split between (skips the selection prompt).",
+)
+@click.option(
+    "--split-values",
+    help="Comma-separated name=value pairs for non-equal splits (skips the per-person prompt).",
+)
+def add(desc, amount, paid_by, split_mode, currency, involved, split_values):
     """Add expense."""
+    if split_values and split_mode in (None, "equal"):
+        raise click.UsageError("--split-values needs --split shares, percent or exact.")
+    split_mode = split_mode or "equal"
     try:
         all_known_people = expense_service.get_all_people()
         involved_list_final = []
 
-        if not all_known_people:
+        if involved:
+            temp_selected_people_for_loop = _resolve_involved(
+                involved, all_known_people
+            )
+        elif not all_known_people:
             click.echo(
                 click.style(
                     "No people known yet. The payer will be the only person involved in splitting this expense.",
                     fg="yellow",
                 )
             )
-            involved_list_final = [paid_by]
+            temp_selected_people_for_loop = [paid_by]
         else:
             click.echo("\n--- Select People Involved in Splitting ---")
             for i, person in enumerate(all_known_people):
@@ -162,19 +223,47 @@ def add(desc, amount, paid_by):
 
         involved_list_final = sorted(list(set(involved_list_final)))
 
+        if split_values:
+            split_values = _parse_split_values(split_values)
+        elif split_mode != "equal":
+            split_values = {}
+            unit = {"shares": "shares", "percent": "%", "exact": "amount"}[split_mode]
+            click.echo(f"\n--- Enter {unit} per person ---")
+            click.echo(
+                click.style(
+                    "Press Enter to skip a person; skipped people split the rest equally.",
+                    fg="cyan",
+                )
+            )
+            for person in involved_list_final:
+                value_input = click.prompt(
+                    f"  {person} ({unit})", default="", show_default=False
+                ).strip()
+                if value_input:
+                    split_values[person] = float(value_input)
+
         expense = expense_service.add_new_expense(
-            desc, amount, paid_by, involved_list_final
+            desc,
+            amount,
+            paid_by,
+            involved_list_final,
+            split_mode,
+            split_values,
+            currency,
         )
         click.echo(
             click.style(
                 f"\nExpense '{expense.description}' added successfully!", fg="green"
             )
         )
-        click.echo(f"  Total: ${expense.amount:.2f}, Paid by: {expense.paid_by}")
+        click.echo(
+            f"  Total: {format_money(expense.amount, expense.currency)}, Paid by: {expense.paid_by}"
+        )
         click.echo(
             f"  Split among {len(expense.involved_people)} people: {', '.join(expense.involved_people)}"
         )
-        click.echo(f"  Each owes: ${expense.split_amount_per_person:.2f}")
+        for person, share in expense.get_shares().items():
+            click.echo(f"    {person} owes: {format_money(share, expense.currency)}")
 
     except ValueError as e:
         click.echo(click.style(f"Error adding expense: {e}", fg="red"))
@@ -212,13 +301,21 @@ def view():
     default="Direct Payment",
     help="Optional description for the payment (default: 'Direct Payment').",
 )
-def pay(payer, payee, amount, desc):
+@click.option(
+    "--currency",
+    default=DEFAULT_CURRENCY,
+    show_default=True,
+    help="Currency code of the payment (e.g. INR, USD).",
+)
+def pay(payer, payee, amount, desc, currency):
     """Record direct payment."""
     try:
-        payment = expense_service.add_new_payment(payer, payee, amount, desc)
+        payment = expense_service.add_new_payment(
+            payer, payee, amount, desc, currency
+        )
         click.echo(
             click.style(
-                f"\nPayment recorded: '{payment.description}' from {payment.payer} to {payment.payee} for ${payment.amount:.2f}",
+                f"\nPayment recorded: '{payment.description}' from {payment.payer} to {payment.payee} for {format_money(payment.amount, payment.currency)}",
                 fg="green",
             )
         )
@@ -235,6 +332,30 @@ def view_payments():
     display.print_all_payments(payments)
 
 
+@cli.command()
+@click.argument("terms", nargs=-1)
+@click.option(
+    "--person",
+    "people",
+    multiple=True,
+    help="Only records involving this person (repeatable).",
+)
+@click.option("--min-amount", type=float, help="Minimum amount (inclusive).")
+@click.option("--max-amount", type=float, help="Maximum amount (inclusive).")
+@click.option("--from", "date_from", help="Earliest date, YYYY-MM-DD (inclusive).")
+@click.option("--to", "date_to", help="Latest date, YYYY-MM-DD (inclusive).")
+def search(terms, people, min_amount, max_amount, date_from, date_to):
+    """Search expenses by description words and filters.
+
+    All words must match; end a word with * for a prefix match (e.g. din*).
+    Payments are included only when no words are given.
+    """
+    expenses, payments = expense_service.search(
+        terms, people, min_amount, max_amount, date_from, date_to
+    )
+    display.print_search_results(expenses, payments)
+
+
 @cli.command("add-person")
 @click.option("--name", prompt="Enter person's name", help="Name of the person to add.")
 def add_person(name):
@@ -259,16 +380,36 @@ def list_people():
 
 
 @cli.command()
-def balances():
+@click.option(
+    "--currency",
+    default=DEFAULT_CURRENCY,
+    show_default=True,
+    help="Settlement currency to convert all amounts into.",
+)
+def balances(currency):
     """Show current balances between people (including payments)."""
-    balances = expense_service.get_current_balances()
-    display.print_balances(balances)
+    try:
+        balances = expense_service.get_current_balances(currency)
+    except ValueError as e:
+        click.echo(click.style(f"Error calculating balances: {e}", fg="red"))
+        return
+    display.print_balances(balances, currency.upper())
 
 
 @cli.command()
-def settle():
+@click.option(
+    "--currency",
+    default=DEFAULT_CURRENCY,
+    show_default=True,
+    help="Settlement currency to convert all amounts into.",
+)
+def settle(currency):
     """Show suggested transactions to settle debts (including payments)."""
-    settlements = expense_service.get_suggested_settlements()
+    try:
+        settlements = expense_service.get_suggested_settlements(currency)
+    except ValueError as e:
+        click.echo(click.style(f"Error calculating settlements: {e}", fg="red"))
+        return
     display.print_settlements(settlements)
 
 
@@ -278,22 +419,251 @@ def settle():
     default=f"expensething_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
     help="Output PDF filename",
 )
-def export_pdf(filename):
+@click.option(
+    "--currency",
+    default=DEFAULT_CURRENCY,
+    show_default=True,
+    help="Settlement currency for balances, settlements and stats.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Regenerate the PDF instead of reusing a cached copy (the cache entry is refreshed).",
+)
+def export_pdf(filename, currency, no_cache):
     """Export all information to a nicely formatted PDF."""
+    # Imported here so the other commands work without wkhtmltopdf installed
+    from utils.pdf_export import (
+        copy_cached_pdf,
+        export_summary_to_pdf,
+        report_cache_key,
+    )
+
     if not filename.startswith("data" + os.sep):
         filename = os.path.join("data", filename)
     people = expense_service.get_all_people()
     expenses = expense_service.get_all_expenses()
     payments = expense_service.get_all_payments()
-    balances = expense_service.get_current_balances()
-    settlements = expense_service.get_suggested_settlements()
+    currency = currency.upper()
 
-    export_summary_to_pdf(filename, people, expenses, payments, balances, settlements)
+    # An unchanged report needs no balance calculation at all
+    cache_key = report_cache_key(
+        people, expenses, payments, currency, expense_service.exchange_rates
+    )
+    if not no_cache and copy_cached_pdf(filename, cache_key):
+        click.echo(
+            click.style(
+                f"Exported summary to {os.path.abspath(filename)} (from cache)",
+                fg="green",
+            )
+        )
+        return
+
+    try:
+        balances = expense_service.get_current_balances(currency)
+        settlements = expense_service.get_suggested_settlements(currency)
+    except ValueError as e:
+        click.echo(click.style(f"Error preparing report: {e}", fg="red"))
+        return
+
+    export_summary_to_pdf(
+        filename,
+        people,
+        expenses,
+        payments,
+        balances,
+        settlements,
+        currency,
+        expense_service.exchange_rates,
+        use_cache=not no_cache,
+        cache_key=cache_key,
+    )
 
     click.echo(
         click.style(f"Exported summary to {os.path.abspath(filename)}", fg="green")
     )
 
 
+@cli.command("export")
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["csv", "tsv", "html"]),
+    default="csv",
+    show_default=True,
+    help="Output format.",
+)
+@click.option(
+    "--filename",
+    default=f"expensething_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}",
+    help="Output filename (CSV/TSV get one file per section, suffixed with its name).",
+)
+@click.option(
+    "--section",
+    "sections",
+    type=click.Choice(SECTIONS),
+    multiple=True,
+    help="Section to export, CSV/TSV only (repeatable, default: all).",
+)
+@click.option(
+    "--currency",
+    default=DEFAULT_CURRENCY,
+    show_default=True,
+    help="Settlement currency for balances, settlements and stats.",
+)
+def export(fmt, filename, sections, currency):
+    """Export report data as CSV, TSV or standalone HTML (no wkhtmltopdf needed)."""
+    if fmt == "html" and sections:
+        raise click.UsageError("--section only applies to CSV/TSV exports.")
+    if not filename.startswith("data" + os.sep):
+        filename = os.path.join("data", filename)
+    currency = currency.upper()
+    try:
+        context = build_report_context(
+            expense_service.get_all_people(),
+            expense_service.get_all_expenses(),
+            expense_service.get_all_payments(),
+            expense_service.get_current_balances(currency),
+            expense_service.get_suggested_settlements(currency),
+            currency,
+            expense_service.exchange_rates,
+        )
+    except ValueError as e:
+        click.echo(click.style(f"Error preparing report: {e}", fg="red"))
+        return
+
+    if fmt == "html":
+        if not filename.endswith(".html"):
+            filename += ".html"
+        export_html(filename, context)
+        written = [filename]
+    else:
+        delimiter = "\t" if fmt == "tsv" else ","
+        written = export_delimited(filename, context, sections or SECTIONS, delimiter)
+
+    for path in written:
+        click.echo(click.style(f"Exported {os.path.abspath(path)}", fg="green"))
+
+
+def _batch_add(cmd):
+    involved = cmd.get("involved")
+    if involved:
+        items = involved.split(",") if isinstance(involved, str) else involved
+        # Only build the full people list when numbers need resolving
+        needs_numbers = any(str(item).strip().isdigit() for item in items)
+        known = expense_service.get_all_people() if needs_numbers else []
+        involved_list = _resolve_involved(items, known)
+    else:
+        raise ValueError("'involved' is required for batch adds.")
+
+    split_values = cmd.get("split_values") or {}
+    if isinstance(split_values, str):
+        split_values = _parse_split_values(split_values)
+
+    expense = expense_service.add_new_expense(
+        cmd.get("desc", ""),
+        float(cmd.get("amount", 0)),
+        cmd.get("paid_by", ""),
+        involved_list,
+        cmd.get("split", "equal"),
+        split_values,
+        cmd.get("currency", DEFAULT_CURRENCY),
+    )
+    return dict(expense.to_dict(), shares=expense.get_shares())
+
+
+def _batch_pay(cmd):
+    payment = expense_service.add_new_payment(
+        cmd.get("payer", ""),
+        cmd.get("payee", ""),
+        float(cmd.get("amount", 0)),
+        cmd.get("desc", "Direct Payment"),
+        cmd.get("currency", DEFAULT_CURRENCY),
+    )
+    return payment.to_dict()
+
+
+def _as_list(value):
+    # Accept "a,b" as well as ["a", "b"], like "involved" on add
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return list(value or [])
+
+
+def _as_float(value):
+    return None if value is None else float(value)
+
+
+def _batch_search(cmd):
+    return expense_service.search_ids(
+        _as_list(cmd.get("terms")),
+        _as_list(cmd.get("people")),
+        _as_float(cmd.get("min_amount")),
+        _as_float(cmd.get("max_amount")),
+        cmd.get("from"),
+        cmd.get("to"),
+    )
+
+
+BATCH_COMMANDS = {
+    "add": _batch_add,
+    "pay": _batch_pay,
+    "add-person": lambda cmd: {"added": expense_service.add_person(cmd.get("name", ""))},
+    "list-people": lambda cmd: expense_service.get_all_people(),
+    "balances": lambda cmd: expense_service.get_current_balances(
+        cmd.get("currency", DEFAULT_CURRENCY)
+    ),
+    "settle": lambda cmd: expense_service.get_suggested_settlements(
+        cmd.get("currency", DEFAULT_CURRENCY)
+    ),
+    "search": _batch_search,
+}
+
+
+@cli.command()
+@click.argument("input_file", type=click.File("r"), default="-")
+@click.option(
+    "--stop-on-error",
+    is_flag=True,
+    help="Stop at the first failing command (earlier changes are still saved).",
+)
+def batch(input_file, stop_on_error):
+    """Run JSON-lines commands from a file (or stdin) in one go.
+
+    Each line is an object like {"command": "add", "desc": "Lunch",
+    "amount": 30, "paid_by": "Alice", "involved": "Alice,Bob"}.
+    Supported commands: add, pay, add-person, list-people, balances,
+    settle, search. One JSON result line is printed per command and all
+    changes are saved once at the end.
+    """
+    with expense_service.batch():
+        for line_number, line in enumerate(input_file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            name = None
+            try:
+                cmd = json.loads(line)
+                name = cmd.get("command")
+                if name not in BATCH_COMMANDS:
+                    raise ValueError(f"Unknown command '{name}'.")
+                result = {
+                    "line": line_number,
+                    "command": name,
+                    "ok": True,
+                    "result": BATCH_COMMANDS[name](cmd),
+                }
+            except Exception as e:
+                result = {
+                    "line": line_number,
+                    "command": name,
+                    "ok": False,
+                    "error": str(e),
+                }
+            click.echo(json.dumps(result))
+            if stop_on_error and not result["ok"]:
+                break
+
+
 if __name__ == "__main__":
     cli()
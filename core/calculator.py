@@ -1,9 +1,11 @@
 import os
 from collections import defaultdict
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from decimal import Decimal, getcontext
 
+from core.currency import ExchangeRateTable
 from core.models import Expense, Payment
+from core.splitter import owed_cents_by_person, to_cents
 
 getcontext().prec = 2
 
@@ -19,31 +21,79 @@ def log_debug(message: str):
 
 
 class ExpenseCalculator:
+    def _bucket_key(self, record, currency: Optional[str]) -> Tuple:
+        # Rows already in the settlement currency never need a rate lookup
+        if currency is None or record.currency == currency:
+            return (None, None)
+        return (record.currency, record.date[:10])
+
+    def _convert_buckets(
+        self,
+        buckets: Dict[Tuple, Dict[str, int]],
+        currency: Optional[str],
+        rates: Optional[ExchangeRateTable],
+    ) -> Dict[str, float]:
+        """Converts per-(currency, day) cent totals with one rate lookup each."""
+        totals = defaultdict(float)
+        for (from_currency, day), amounts in buckets.items():
+            if from_currency is None:
+                rate = 1.0
+            elif rates is None:
+                raise ValueError(
+                    f"No exchange rates available to convert {from_currency} to {currency}."
+                )
+            else:
+                rate = rates.get_rate(day, from_currency, currency)
+            for person, cents in amounts.items():
+                totals[person] += cents * rate
+        return {person: round(cents / 100, 2) for person, cents in totals.items()}
+
     def calculate_balances(
-        self, expenses: List[Expense], payments: List[Payment]
+        self,
+        expenses: List[Expense],
+        payments: List[Payment],
+        currency: Optional[str] = None,
+        rates: Optional[ExchangeRateTable] = None,
     ) -> Dict[str, float]:
-        """Calculates net balance for each person."""
-        balances = defaultdict(float)
+        """Calculates net balance for each person, optionally in one currency."""
+        # Work in integer cents so split remainders never leak into balances,
+        # grouped by (currency, day) so each group is converted only once
+        buckets = defaultdict(lambda: defaultdict(int))
+        grouped_expenses = defaultdict(list)
 
         for exp in expenses:
-            paid_by = exp.paid_by
-            amount = exp.amount
-            involved_people = exp.involved_people
-            split_amount = exp.split_amount_per_person
-
-            balances[paid_by] += amount
-            for person in involved_people:
-                balances[person] -= split_amount
+            key = self._bucket_key(exp, currency)
+            buckets[key][exp.paid_by] += to_cents(exp.amount)
+            grouped_expenses[key].append(exp)
+        for key, group in grouped_expenses.items():
+            for person, owed in owed_cents_by_person(group).items():
+                buckets[key][person] -= owed
 
         for payment in payments:
-            payer = payment.payer
-            payee = payment.payee
-            amount = payment.amount
+            key = self._bucket_key(payment, currency)
+            amount = to_cents(payment.amount)
+
+            buckets[key][payment.payer] += amount
+            buckets[key][payment.payee] -= amount
 
-            balances[payer] += amount
-            balances[payee] -= amount
+        return self._convert_buckets(buckets, currency, rates)
+
+    def calculate_owed(
+        self,
+        expenses: List[Expense],
+        currency: Optional[str] = None,
+        rates: Optional[ExchangeRateTable] = None,
+    ) -> Dict[str, float]:
+        """Calculates each person's total share of expenses."""
+        grouped_expenses = defaultdict(list)
+        for exp in expenses:
+            grouped_expenses[self._bucket_key(exp, currency)].append(exp)
 
-        return dict(balances)
+        buckets = {
+            key: owed_cents_by_person(group)
+            for key, group in grouped_expenses.items()
+        }
+        return self._convert_buckets(buckets, currency, rates)
 
     def simplify_debts(
         self, balances: Dict[str, float]
@@ -0,0 +1,107 @@
+import math
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from core.data_manager import JSONDataManager
+
+DEFAULT_CURRENCY = "INR"
+
+CURRENCY_SYMBOLS = {
+    "INR": "₹",
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "JPY": "¥",
+}
+
+
+def normalize_currency(code: str) -> str:
+    """Validates and upper-cases a three-letter currency code."""
+    code = (code or "").strip().upper()
+    if len(code) != 3 or not code.isalpha():
+        raise ValueError(f"Invalid currency code '{code}'.")
+    return code
+
+
+def format_money(amount: float, currency: str = DEFAULT_CURRENCY) -> str:
+    """Formats an amount with its currency symbol (or code if unknown)."""
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    if symbol:
+        return f"{symbol}{amount:.2f}"
+    return f"{currency} {amount:.2f}"
+
+
+class ExchangeRateTable:
+    """Exchange rates loaded from a local JSON file, keyed by date.
+
+    The file looks like::
+
+        {"base": "USD", "rates": {"2024-01-01": {"INR": 83.2, "EUR": 0.91}}}
+
+    where each rate is how many units of a currency one unit of ``base`` buys.
+    A lookup uses the most recent rate on or before the requested day (or
+    the earliest known rate for days before the table starts).
+    """
+
+    def __init__(self, filepath: str, cache_size: int = 1024):
+        self.data_manager = JSONDataManager(filepath)
+        self._series = None
+        self._base = None
+        self.get_rate = lru_cache(maxsize=cache_size)(self._lookup_rate)
+
+    def _load(self):
+        data = self.data_manager.load_raw_data()
+        if not isinstance(data, dict):
+            data = {}
+        self._base = normalize_currency(data.get("base", DEFAULT_CURRENCY))
+
+        # One sorted (dates, rates) series per currency for bisecting
+        rates = data.get("rates", {})
+        if not isinstance(rates, dict):
+            raise ValueError("Exchange rate file: 'rates' must map dates to rates.")
+
+        series: Dict[str, Tuple[List[str], List[float]]] = {}
+        for day in sorted(rates):
+            day_rates = rates[day]
+            if not isinstance(day_rates, dict):
+                raise ValueError(
+                    f"Exchange rate file: rates for {day} must map currencies to numbers."
+                )
+            for code, rate in day_rates.items():
+                if (
+                    isinstance(rate, bool)
+                    or not isinstance(rate, (int, float))
+                    or not math.isfinite(rate)
+                    or rate <= 0
+                ):
+                    raise ValueError(
+                        f"Exchange rate file: invalid rate {rate!r} for {code} on {day}."
+                    )
+                dates, values = series.setdefault(code.upper(), ([], []))
+                dates.append(day[:10])
+                values.append(float(rate))
+        self._series = series
+
+    def _rate_from_base(self, day: str, currency: str) -> float:
+        if currency == self._base:
+            return 1.0
+        if currency not in self._series:
+            raise ValueError(f"No exchange rate known for {currency}.")
+        dates, values = self._series[currency]
+        index = max(bisect_right(dates, day) - 1, 0)
+        return values[index]
+
+    def _lookup_rate(self, day: str, from_currency: str, to_currency: str) -> float:
+        if from_currency == to_currency:
+            return 1.0
+        if self._series is None:
+            self._load()
+        return self._rate_from_base(day, to_currency) / self._rate_from_base(
+            day, from_currency
+        )
+
+    def reload(self):
+        """Re-reads the rate file and drops cached lookups."""
+        self._series = None
+        self.get_rate.cache_clear()
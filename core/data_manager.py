@@ -35,7 +35,11 @@ class JSONDataManager:
         except (FileNotFoundError, json.JSONDecodeError):
             return []
 
-    def save_raw_data(self, data: Any):
-        """Saves raw Python data to JSON."""
+    def save_raw_data(self, data: Any, compact: bool = False):
+        """Saves raw Python data to JSON (without indentation if compact)."""
         with open(self.filepath, "w") as f:
-            json.dump(data, f, indent=4)
+            if compact:
+                # dumps() uses the C encoder; dump() streams through Python
+                f.write(json.dumps(data, separators=(",", ":")))
+            else:
+                json.dump(data, f, indent=4)
@@ -2,6 +2,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Optional
 
+from core.currency import DEFAULT_CURRENCY
+from core.splitter import split_amount
+
 
 @dataclass
 class Expense:
@@ -10,13 +13,32 @@ class Expense:
     amount: float
     paid_by: str
     involved_people: List[str]
-    split_amount_per_person: float
+    # Rounded equal share, kept for older readers; None for non-equal
+    # splits. Use get_shares() for what each person actually owes.
+    split_amount_per_person: Optional[float]
     date: str = field(
         default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     )
+    # "equal", "shares", "percent" or "exact"; people missing from
+    # split_values get an equal part of whatever is left.
+    split_mode: str = "equal"
+    split_values: Dict[str, float] = field(default_factory=dict)
+    currency: str = DEFAULT_CURRENCY
+
+    def get_shares(self) -> Dict[str, float]:
+        """Returns how much each involved person owes for this expense."""
+        return split_amount(
+            self.amount, self.involved_people, self.split_mode, self.split_values
+        )
 
     def to_dict(self) -> Dict:
-        return self.__dict__
+        data = dict(self.__dict__)
+        # Keep equal splits stored exactly as before
+        if data.get("split_mode") == "equal":
+            data.pop("split_mode")
+        if not data.get("split_values"):
+            data.pop("split_values", None)
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict):
@@ -33,6 +55,7 @@ class Payment:
         default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     )
     description: str = "Direct Payment"
+    currency: str = DEFAULT_CURRENCY
 
     def to_dict(self) -> Dict:
         return self.__dict__
@@ -0,0 +1,244 @@
+import re
+from itertools import islice
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional
+
+from core.data_manager import JSONDataManager
+from core.models import Expense, Payment
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens of a description, without duplicates."""
+    return sorted(set(TOKEN_PATTERN.findall(text.lower())))
+
+
+def _intersect_sorted(a: List[int], b: List[int]) -> List[int]:
+    """Intersects two sorted ID lists by bisecting the shorter into the longer."""
+    if len(a) > len(b):
+        a, b = b, a
+    result = []
+    lo = 0
+    for item in a:
+        lo = bisect_left(b, item, lo)
+        if lo == len(b):
+            break
+        if b[lo] == item:
+            result.append(item)
+    return result
+
+
+def _union_sorted(lists: Iterable[List[int]]) -> List[int]:
+    merged = set()
+    for ids in lists:
+        merged.update(ids)
+    return sorted(merged)
+
+
+def _range_ids(pairs: List[list], low, high) -> List[int]:
+    # pairs is sorted by [value, id]; None bounds are open
+    start = bisect_left(pairs, [low]) if low is not None else 0
+    end = bisect_right(pairs, [high, float("inf")]) if high is not None else len(pairs)
+    return sorted(pair[1] for pair in pairs[start:end])
+
+
+class SearchIndex:
+    """Persisted inverted index over expenses and payments.
+
+    Stores token -> expense IDs, person -> expense/payment IDs and
+    (amount, id) / (date, id) pairs sorted for range filters. Every ID list
+    is kept sorted so queries only bisect and intersect.
+    """
+
+    def __init__(self, filepath: str):
+        self.data_manager = JSONDataManager(filepath)
+        self._data = None
+        self._sorted_tokens = None
+
+    @staticmethod
+    def _empty() -> Dict:
+        return {
+            "expense_high_water": 0,
+            "payment_high_water": 0,
+            "tokens": {},
+            "people": {},
+            "expense_amounts": [],
+            "expense_dates": [],
+            "payment_amounts": [],
+            "payment_dates": [],
+            # (mtime_ns, size) of each ledger file when the index last matched it
+            "sources": {},
+        }
+
+    @property
+    def data(self) -> Dict:
+        if self._data is None:
+            data = self.data_manager.load_raw_data()
+            self._data = data if isinstance(data, dict) and data else self._empty()
+        return self._data
+
+    def save(self):
+        # Compact: the index is as large as the ledgers and never hand-edited
+        self.data_manager.save_raw_data(self.data, compact=True)
+
+    def _index_person(self, name: str, kind: str, record_id: int):
+        entry = self.data["people"].setdefault(
+            name.strip().lower(), {"expenses": [], "payments": []}
+        )
+        if not entry[kind] or entry[kind][-1] != record_id:
+            entry[kind].append(record_id)
+
+    # New IDs are always above the high-water mark, so ID lists stay sorted
+    # by appending; only the (value, id) pairs need re-sorting.
+    def _index_expense(self, expense: Expense):
+        data = self.data
+        for token in tokenize(expense.description):
+            if token not in data["tokens"]:
+                self._sorted_tokens = None
+            data["tokens"].setdefault(token, []).append(expense.id)
+        for name in set([expense.paid_by] + list(expense.involved_people)):
+            self._index_person(name, "expenses", expense.id)
+        data["expense_amounts"].append([expense.amount, expense.id])
+        data["expense_dates"].append([expense.date, expense.id])
+        data["expense_high_water"] = max(data["expense_high_water"], expense.id)
+
+    def _index_payment(self, payment: Payment):
+        data = self.data
+        for name in {payment.payer, payment.payee}:
+            self._index_person(name, "payments", payment.id)
+        data["payment_amounts"].append([payment.amount, payment.id])
+        data["payment_dates"].append([payment.date, payment.id])
+        data["payment_high_water"] = max(data["payment_high_water"], payment.id)
+
+    def is_current(self, kind: str, stamp: List[int]) -> bool:
+        """Whether the index matches the ledger file with this stamp."""
+        return self.data.get("sources", {}).get(kind) == stamp
+
+    def set_source(self, kind: str, stamp: List[int]):
+        self.data.setdefault("sources", {})[kind] = stamp
+
+    def high_water(self, kind: str) -> int:
+        """Highest indexed ID for "expenses" or "payments"."""
+        return self.data[f"{kind[:-1]}_high_water"]
+
+    def _reset_kind(self, kind: str):
+        data = self.data
+        singular = kind[:-1]
+        data[f"{singular}_high_water"] = 0
+        data[f"{singular}_amounts"] = []
+        data[f"{singular}_dates"] = []
+        for entry in data["people"].values():
+            entry[kind] = []
+        if kind == "expenses":
+            data["tokens"] = {}
+            self._sorted_tokens = None
+
+    def add_expense(self, expense: Expense):
+        """Indexes one expense whose ID is above the high-water mark."""
+        self._index_expense(expense)
+        # Move the appended pairs into place instead of re-sorting everything
+        for key in ("expense_amounts", "expense_dates"):
+            insort(self.data[key], self.data[key].pop())
+
+    def add_payment(self, payment: Payment):
+        """Indexes one payment whose ID is above the high-water mark."""
+        self._index_payment(payment)
+        for key in ("payment_amounts", "payment_dates"):
+            insort(self.data[key], self.data[key].pop())
+
+    def rebuild(self, kind: str, records: List):
+        """Re-indexes every expense or payment from scratch.
+
+        Used when the ledger changed outside the service (the index predates
+        it, it was reset or edited by hand), where new rows can't be told
+        apart from changed ones.
+        """
+        self._reset_kind(kind)
+        index_record = self._index_expense if kind == "expenses" else self._index_payment
+        for record in sorted(records, key=lambda r: r.id):
+            index_record(record)
+        singular = kind[:-1]
+        self.data[f"{singular}_amounts"].sort()
+        self.data[f"{singular}_dates"].sort()
+
+    def _term_ids(self, term: str) -> List[int]:
+        tokens = self.data["tokens"]
+        if not term.endswith("*"):
+            return tokens.get(term, [])
+
+        # Prefix query: union of every token starting with the prefix
+        prefix = term[:-1]
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(tokens)
+        keys = self._sorted_tokens
+        start = bisect_left(keys, prefix)
+        matches = []
+        for key in islice(keys, start, None):
+            if not key.startswith(prefix):
+                break
+            matches.append(tokens[key])
+        return _union_sorted(matches)
+
+    def search(
+        self,
+        terms: Iterable[str] = (),
+        people: Iterable[str] = (),
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> Dict[str, List[int]]:
+        """Returns sorted expense and payment IDs matching every given filter.
+
+        Terms match expense descriptions (a trailing ``*`` makes a prefix
+        query), so payments are only returned when no terms are given.
+        Dates compare as ``YYYY-MM-DD[ HH:MM:SS]`` prefixes, both inclusive.
+        """
+        data = self.data
+        terms = [t for term in terms for t in self._split_term(term)]
+        people = [p.strip().lower() for p in people if p.strip()]
+        date_high = f"{date_to}~" if date_to else None
+
+        results = {}
+        for kind in ("expenses", "payments"):
+            singular = kind[:-1]
+            candidates: List[List[int]] = []
+            if terms:
+                if kind == "payments":
+                    results[kind] = []
+                    continue
+                candidates.extend(self._term_ids(t) for t in terms)
+            for person in people:
+                candidates.append(data["people"].get(person, {}).get(kind, []))
+            if min_amount is not None or max_amount is not None:
+                candidates.append(
+                    _range_ids(data[f"{singular}_amounts"], min_amount, max_amount)
+                )
+            if date_from or date_to:
+                candidates.append(
+                    _range_ids(data[f"{singular}_dates"], date_from, date_high)
+                )
+
+            if not candidates:
+                ids = [pair[1] for pair in data[f"{singular}_dates"]]
+                results[kind] = sorted(ids)
+                continue
+
+            # Intersect smallest lists first so the working set shrinks fast
+            candidates.sort(key=len)
+            ids = candidates[0]
+            for other in candidates[1:]:
+                if not ids:
+                    break
+                ids = _intersect_sorted(ids, other)
+            results[kind] = list(ids)
+        return results
+
+    @staticmethod
+    def _split_term(term: str) -> List[str]:
+        # Keep a trailing "*" attached to the last token of the term
+        tokens = TOKEN_PATTERN.findall(term.lower())
+        if tokens and term.strip().endswith("*"):
+            tokens[-1] += "*"
+        return tokens
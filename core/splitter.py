@@ -0,0 +1,137 @@
+import math
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SPLIT_MODES = ("equal", "shares", "percent", "exact")
+
+
+def to_cents(amount: float) -> int:
+    """Converts a currency amount to integer cents."""
+    if not math.isfinite(amount):
+        raise ValueError("Amount must be a finite number.")
+    return int(round(amount * 100))
+
+
+def _normalize_values(
+    people: Tuple[str, ...], values: Optional[Dict[str, float]]
+) -> Tuple[Tuple[str, float], ...]:
+    # Only keep entries for people actually involved, in a stable order
+    if not values:
+        return ()
+    return tuple((p, float(values[p])) for p in people if p in values)
+
+
+def _allocate_by_weights(total: int, people: List[str], weights: List[float]) -> List[int]:
+    """Largest-remainder allocation of integer cents by weight.
+
+    Leftover cents go to the largest fractional parts; ties are broken by
+    the order of ``people`` so the result is deterministic.
+    """
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        raise ValueError("Split weights must add up to more than zero.")
+
+    raw = [total * w / weight_sum for w in weights]
+    alloc = [int(r) for r in raw]
+    leftover = total - sum(alloc)
+    order = sorted(range(len(people)), key=lambda i: (alloc[i] - raw[i], i))
+    for i in order[:leftover]:
+        alloc[i] += 1
+    return alloc
+
+
+@lru_cache(maxsize=4096)
+def _allocate_cents(
+    total: int,
+    people: Tuple[str, ...],
+    mode: str,
+    values: Tuple[Tuple[str, float], ...],
+) -> Tuple[int, ...]:
+    n = len(people)
+    if mode == "equal" or (not values and mode != "exact"):
+        base, extra = divmod(total, n)
+        return tuple(base + 1 if i < extra else base for i in range(n))
+
+    given = dict(values)
+    if any(v < 0 for v in given.values()):
+        raise ValueError("Split values cannot be negative.")
+    omitted = [p for p in people if p not in given]
+
+    if mode == "shares":
+        weights = [given.get(p, 1.0) for p in people]
+        return tuple(_allocate_by_weights(total, list(people), weights))
+
+    if mode == "percent":
+        specified = sum(given.values())
+        if specified > 100 + 1e-9:
+            raise ValueError("Percentages cannot add up to more than 100.")
+        if not omitted and abs(specified - 100) > 0.01:
+            raise ValueError("Percentages must add up to 100.")
+        rest = (100 - specified) / len(omitted) if omitted else 0.0
+        weights = [given.get(p, rest) for p in people]
+        return tuple(_allocate_by_weights(total, list(people), weights))
+
+    if mode == "exact":
+        fixed = {p: to_cents(v) for p, v in given.items()}
+        remaining = total - sum(fixed.values())
+        if remaining < 0:
+            raise ValueError("Exact amounts cannot exceed the expense total.")
+        if not omitted and remaining != 0:
+            raise ValueError("Exact amounts must add up to the expense total.")
+        if omitted:
+            base, extra = divmod(remaining, len(omitted))
+            for i, p in enumerate(omitted):
+                fixed[p] = base + 1 if i < extra else base
+        return tuple(fixed[p] for p in people)
+
+    raise ValueError(f"Unknown split mode '{mode}'.")
+
+
+def split_cents(
+    amount: float,
+    people: List[str],
+    mode: str = "equal",
+    values: Optional[Dict[str, float]] = None,
+) -> Dict[str, int]:
+    """Splits an amount between people, returning each person's share in cents."""
+    if not people:
+        raise ValueError("No people selected for splitting.")
+    key = tuple(people)
+    alloc = _allocate_cents(to_cents(amount), key, mode, _normalize_values(key, values))
+    return dict(zip(key, alloc))
+
+
+def split_amount(
+    amount: float,
+    people: List[str],
+    mode: str = "equal",
+    values: Optional[Dict[str, float]] = None,
+) -> Dict[str, float]:
+    """Splits an amount between people, returning each person's share."""
+    return {p: c / 100 for p, c in split_cents(amount, people, mode, values).items()}
+
+
+def owed_cents_by_person(expenses: Iterable) -> Dict[str, int]:
+    """Totals how many cents each person owes across many expenses.
+
+    Identical splits (same amount, people, mode and values) are allocated
+    once and multiplied, so recurring expenses cost a single allocation.
+    """
+    groups = Counter(
+        (
+            to_cents(exp.amount),
+            tuple(exp.involved_people),
+            exp.split_mode,
+            _normalize_values(tuple(exp.involved_people), exp.split_values),
+        )
+        for exp in expenses
+    )
+
+    totals = defaultdict(int)
+    for (total, people, mode, values), count in groups.items():
+        if not people:
+            continue
+        for person, cents in zip(people, _allocate_cents(total, people, mode, values)):
+            totals[person] += cents * count
+    return dict(totals)
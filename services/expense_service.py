@@ -1,9 +1,14 @@
+import math
 import os
-from typing import List, Dict
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
 
 from core.models import Expense, Payment
 from core.data_manager import JSONDataManager
 from core.calculator import ExpenseCalculator
+from core.search_index import SearchIndex
+from core.currency import DEFAULT_CURRENCY, ExchangeRateTable, normalize_currency
+from core.splitter import SPLIT_MODES, split_amount
 
 
 class ExpenseService:
@@ -20,31 +25,180 @@ class ExpenseService:
         self.people_data_manager = JSONDataManager(
             os.path.join(project_root_data, "people.json")
         )
+        self.exchange_rates = ExchangeRateTable(
+            os.path.join(project_root_data, "exchange_rates.json")
+        )
+        self.search_index = SearchIndex(
+            os.path.join(project_root_data, "search_index.json")
+        )
         self.calculator = ExpenseCalculator()
+        # Loaded state shared by every call inside a batch() block
+        self._batch = None
+
+    @contextmanager
+    def batch(self):
+        """Loads each data file once and defers all saves until the block ends.
+
+        Changes are written in one go when the block exits normally and are
+        discarded if an exception escapes it.
+        """
+        self._batch = {"dirty": set()}
+        try:
+            yield self
+            self._commit_batch()
+        finally:
+            self._batch = None
+
+    def _commit_batch(self):
+        dirty = self._batch["dirty"]
+        if "expenses" in dirty:
+            self.expense_data_manager.save_items(self._batch["expenses"])
+        if "payments" in dirty:
+            self.payment_data_manager.save_items(self._batch["payments"])
+        if "people" in dirty:
+            self.people_data_manager.save_raw_data(self._batch["people"])
+        # The index now matches the ledger files just written
+        for kind in ("expenses", "payments"):
+            if kind in dirty:
+                self.search_index.set_source(kind, self._ledger_stamp(kind))
+                dirty.add("search_index")
+        if "search_index" in dirty:
+            self.search_index.save()
+
+    def _load(self, key: str, loader):
+        if self._batch is None:
+            return loader()
+        if key not in self._batch:
+            self._batch[key] = loader()
+        return self._batch[key]
+
+    def _save(self, key: str, items, saver):
+        if self._batch is None:
+            saver(items)
+        else:
+            self._batch[key] = items
+            self._batch["dirty"].add(key)
+
+    def _next_id(self, kind: str, records: List) -> int:
+        # Inside a batch the ledger only grows through us, so scan it once
+        key = f"next_id:{kind}"
+        if self._batch is not None and key in self._batch:
+            return self._batch[key]
+        next_id = (max(r.id for r in records) + 1) if records else 1
+        if self._batch is not None:
+            self._batch[key] = next_id
+        return next_id
+
+    def _claim_id(self, kind: str, record_id: int):
+        if self._batch is not None:
+            self._batch[f"next_id:{kind}"] = record_id + 1
+
+    def _ledger_stamp(self, kind: str) -> Optional[List[int]]:
+        manager = (
+            self.expense_data_manager if kind == "expenses" else self.payment_data_manager
+        )
+        try:
+            stat = os.stat(manager.filepath)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _save_search_index(self):
+        if self._batch is None:
+            self.search_index.save()
+        else:
+            self._batch["dirty"].add("search_index")
+
+    def _sync_search_index(self, loaded: Optional[Dict[str, List]] = None):
+        """Rebuilds the index for any ledger changed outside the service.
+
+        Only the ledger files are stat-ed when the index is current; a
+        ledger is read only when its part of the index has to be rebuilt.
+        """
+        loaded = loaded or {}
+        changed = False
+        for kind in ("expenses", "payments"):
+            stamp = self._ledger_stamp(kind)
+            if self.search_index.is_current(kind, stamp):
+                continue
+            records = loaded.get(kind)
+            if records is None:
+                records = (
+                    self.get_all_expenses() if kind == "expenses" else self.get_all_payments()
+                )
+            self.search_index.rebuild(kind, records)
+            self.search_index.set_source(kind, stamp)
+            changed = True
+        if changed:
+            self._save_search_index()
+
+    def _index_new_record(self, kind: str, record):
+        """Indexes a just-inserted record; the index was synced beforehand."""
+        if kind == "expenses":
+            self.search_index.add_expense(record)
+        else:
+            self.search_index.add_payment(record)
+        # Outside a batch the ledger was just saved; inside one the file is
+        # untouched until the commit, which records the final stamp
+        self.search_index.set_source(kind, self._ledger_stamp(kind))
+        self._save_search_index()
 
     def get_all_expenses(self) -> List[Expense]:
         """Retrieves all expenses."""
-        return self.expense_data_manager.load_items(Expense)
+        return self._load(
+            "expenses", lambda: self.expense_data_manager.load_items(Expense)
+        )
 
     def add_new_expense(
-        self, description: str, amount: float, paid_by: str, involved_people: List[str]
+        self,
+        description: str,
+        amount: float,
+        paid_by: str,
+        involved_people: List[str],
+        split_mode: str = "equal",
+        split_values: Optional[Dict[str, float]] = None,
+        currency: str = DEFAULT_CURRENCY,
     ) -> Expense:
         expenses = self.get_all_expenses()
-        next_id = (max(exp.id for exp in expenses) + 1) if expenses else 1
+        next_id = self._next_id("expenses", expenses)
 
         involved_set = set(p.strip() for p in involved_people if p.strip())
         final_involved_people = sorted(list(involved_set))
 
         if not final_involved_people:
             raise ValueError("No people selected for splitting.")
+        if not math.isfinite(amount):
+            raise ValueError("Amount must be a finite number.")
         if amount <= 0:
             raise ValueError("Amount must be positive.")
         if not description:
             raise ValueError("Description cannot be empty.")
         if not paid_by:
             raise ValueError("Payer name cannot be empty.")
+        currency = normalize_currency(currency)
+        if split_mode not in SPLIT_MODES:
+            raise ValueError(f"Unknown split mode '{split_mode}'.")
 
-        split_amount = amount / len(final_involved_people)
+        # Values must name people in the split; omitted ones share equally
+        final_split_values = {
+            p.strip(): float(v) for p, v in (split_values or {}).items()
+        }
+        unknown = sorted(set(final_split_values) - involved_set)
+        if unknown:
+            raise ValueError(
+                f"Split values given for people not in the split: {', '.join(unknown)}."
+            )
+        if split_mode == "equal" and final_split_values:
+            raise ValueError("Split values need a shares, percent or exact split.")
+        # Validates the split before anything is saved
+        split_amount(amount, final_involved_people, split_mode, final_split_values)
+
+        # Only meaningful for equal splits; get_shares() is the source of truth
+        split_amount_each = (
+            round(amount / len(final_involved_people), 2)
+            if split_mode == "equal"
+            else None
+        )
 
         new_expense = Expense(
             id=next_id,
@@ -52,10 +206,16 @@ class ExpenseService:
             amount=amount,
             paid_by=paid_by,
             involved_people=final_involved_people,
-            split_amount_per_person=round(split_amount, 2),
+            split_amount_per_person=split_amount_each,
+            split_mode=split_mode,
+            split_values=final_split_values,
+            currency=currency,
         )
+        self._sync_search_index({"expenses": expenses})
         expenses.append(new_expense)
-        self.expense_data_manager.save_items(expenses)
+        self._claim_id("expenses", next_id)
+        self._save("expenses", expenses, self.expense_data_manager.save_items)
+        self._index_new_record("expenses", new_expense)
 
         # Register all people involved
         self._add_people_from_list(final_involved_people)
@@ -67,14 +227,23 @@ class ExpenseService:
 
     def get_all_payments(self) -> List[Payment]:
         """Retrieves all payments."""
-        return self.payment_data_manager.load_items(Payment)
+        return self._load(
+            "payments", lambda: self.payment_data_manager.load_items(Payment)
+        )
 
     def add_new_payment(
-        self, payer: str, payee: str, amount: float, description: str = "Direct Payment"
+        self,
+        payer: str,
+        payee: str,
+        amount: float,
+        description: str = "Direct Payment",
+        currency: str = DEFAULT_CURRENCY,
     ) -> Payment:
         payments = self.get_all_payments()
-        next_id = (max(p.id for p in payments) + 1) if payments else 1
+        next_id = self._next_id("payments", payments)
 
+        if not math.isfinite(amount):
+            raise ValueError("Payment amount must be a finite number.")
         if amount <= 0:
             raise ValueError("Payment amount must be positive.")
         if not payer:
@@ -83,6 +252,7 @@ class ExpenseService:
             raise ValueError("Payee name cannot be empty.")
         if payer == payee:
             raise ValueError("Payer and payee cannot be the same person.")
+        currency = normalize_currency(currency)
 
         new_payment = Payment(
             id=next_id,
@@ -90,24 +260,72 @@ class ExpenseService:
             payee=payee,
             amount=round(amount, 2),
             description=description,
+            currency=currency,
         )
+        self._sync_search_index({"payments": payments})
         payments.append(new_payment)
-        self.payment_data_manager.save_items(payments)
+        self._claim_id("payments", next_id)
+        self._save("payments", payments, self.payment_data_manager.save_items)
+        self._index_new_record("payments", new_payment)
 
         # Automatically add payer/payee to the registered list
         self._add_people_from_list([payer, payee])
 
         return new_payment
 
+    def search_ids(
+        self,
+        terms: List[str] = (),
+        people: List[str] = (),
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> Dict[str, List[int]]:
+        """Finds IDs of expenses and payments matching all the given filters.
+
+        Inserts keep the index current; a ledger changed outside the
+        service (including one from before the index existed, or a reset)
+        is re-indexed before the query runs.
+        """
+        self._sync_search_index()
+        return self.search_index.search(
+            terms, people, min_amount, max_amount, date_from, date_to
+        )
+
+    def search(
+        self,
+        terms: List[str] = (),
+        people: List[str] = (),
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> Tuple[List[Expense], List[Payment]]:
+        """Finds expenses and payments matching all the given filters."""
+        ids = self.search_ids(terms, people, min_amount, max_amount, date_from, date_to)
+
+        # Only read the ledgers that actually have hits to show
+        expenses_by_id = (
+            {exp.id: exp for exp in self.get_all_expenses()} if ids["expenses"] else {}
+        )
+        payments_by_id = (
+            {pay.id: pay for pay in self.get_all_payments()} if ids["payments"] else {}
+        )
+        return (
+            [expenses_by_id[i] for i in ids["expenses"] if i in expenses_by_id],
+            [payments_by_id[i] for i in ids["payments"] if i in payments_by_id],
+        )
+
     # --- People Management Methods (NEW) ---
     def _get_registered_people_raw(self) -> List[str]:
         # Helper to load raw list of strings
-        data = self.people_data_manager.load_raw_data()
+        data = self._load("people", self.people_data_manager.load_raw_data)
         return data if isinstance(data, list) else []
 
     def _save_registered_people_raw(self, people: List[str]):
         # Helper to save raw list of strings
-        self.people_data_manager.save_raw_data(people)
+        self._save("people", people, self.people_data_manager.save_raw_data)
 
     def add_person(self, name: str) -> bool:
         """Adds a single person to the registered list if they don't exist."""
@@ -156,12 +374,19 @@ class ExpenseService:
 
         return sorted(list(all_people_set))
 
-    def get_current_balances(self) -> Dict[str, float]:
+    def get_current_balances(self, currency: str = DEFAULT_CURRENCY) -> Dict[str, float]:
+        """Net balances converted into the given settlement currency."""
         expenses = self.get_all_expenses()
         payments = self.get_all_payments()
-        return self.calculator.calculate_balances(expenses, payments)
+        return self.calculator.calculate_balances(
+            expenses, payments, normalize_currency(currency), self.exchange_rates
+        )
 
-    def get_suggested_settlements(self) -> List[Dict]:
-        balances = self.get_current_balances()
+    def get_suggested_settlements(self, currency: str = DEFAULT_CURRENCY) -> List[Dict]:
+        currency = normalize_currency(currency)
+        balances = self.get_current_balances(currency)
         settlements = self.calculator.simplify_debts(balances)
-        return [{"from": s[0], "to": s[1], "amount": s[2]} for s in settlements]
+        return [
+            {"from": s[0], "to": s[1], "amount": s[2], "currency": currency}
+            for s in settlements
+        ]
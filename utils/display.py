@@ -1,4 +1,5 @@
 from typing import List, Dict
+from core.currency import DEFAULT_CURRENCY, format_money
 from core.models import Expense, Payment
 
 
@@ -6,11 +7,11 @@ def print_expense_details(expense: Expense):
     """Prints single expense details."""
     print(f"ID: {expense.id}")
     print(f"  Description: {expense.description}")
-    print(f"  Amount: ${expense.amount:.2f}")
+    print(f"  Amount: {format_money(expense.amount, expense.currency)}")
     print(f"  Paid by: {expense.paid_by}")
-    print(
-        f"  Involved: {', '.join(expense.involved_people)} (each owes ${expense.split_amount_per_person:.2f})"
-    )
+    print(f"  Involved: {', '.join(expense.involved_people)} ({expense.split_mode} split)")
+    for person, share in expense.get_shares().items():
+        print(f"    {person} owes: {format_money(share, expense.currency)}")
     print(f"  Date: {expense.date}")
 
 
@@ -30,7 +31,7 @@ def print_payment_details(payment: Payment):
     """Prints single payment details."""
     print(f"ID: {payment.id}")
     print(f"  Description: {payment.description}")
-    print(f"  Amount: ${payment.amount:.2f}")
+    print(f"  Amount: {format_money(payment.amount, payment.currency)}")
     print(f"  From: {payment.payer}")
     print(f"  To: {payment.payee}")
     print(f"  Date: {payment.date}")
@@ -48,6 +49,24 @@ def print_all_payments(payments: List[Payment]):
         print("-" * 30)
 
 
+def print_search_results(expenses: List[Expense], payments: List[Payment]):
+    """Prints expenses and payments matched by a search."""
+    if not expenses and not payments:
+        print("\nNo matching expenses or payments.")
+        return
+
+    if expenses:
+        print(f"\n--- Matching Expenses ({len(expenses)}) ---")
+        for exp in expenses:
+            print_expense_details(exp)
+            print("-" * 30)
+    if payments:
+        print(f"\n--- Matching Payments ({len(payments)}) ---")
+        for pay in payments:
+            print_payment_details(pay)
+            print("-" * 30)
+
+
 def print_all_people(people: List[str]):
     """Prints a formatted list of all known people."""
     if not people:
@@ -60,7 +79,7 @@ def print_all_people(people: List[str]):
     print("-" * 30)
 
 
-def print_balances(balances: Dict[str, float]):
+def print_balances(balances: Dict[str, float], currency: str = DEFAULT_CURRENCY):
     """Prints formatted current balances."""
     if not balances:
         print("No transactions to calculate balances.")
@@ -68,7 +87,7 @@ def print_balances(balances: Dict[str, float]):
 
     print("\n--- Net Balances ---")
     for person, balance in sorted(balances.items()):
-        print(f"{person}: ${balance:.2f}")
+        print(f"{person}: {format_money(balance, currency)}")
 
 
 def print_settlements(settlements: List[Dict]):
@@ -79,4 +98,5 @@ def print_settlements(settlements: List[Dict]):
 
     print("\n--- Suggested Settlements ---")
     for s in settlements:
-        print(f"{s['from']} owes {s['to']} ${s['amount']:.2f}")
+        amount = format_money(s["amount"], s.get("currency", DEFAULT_CURRENCY))
+        print(f"{s['from']} owes {s['to']} {amount}")
@@ -0,0 +1,78 @@
+import csv
+import os
+
+from utils.report import get_report_template
+
+SECTIONS = ("expenses", "payments", "balances", "settlements", "net_expense")
+
+
+def _section_rows(section, context):
+    """Yields the header row followed by one row per record, lazily."""
+    currency = context["currency"]
+
+    if section == "expenses":
+        yield ["ID", "Description", "Amount", "Currency", "Paid By", "Involved", "Split", "Shares", "Date"]
+        for e in context["expenses"]:
+            shares = "; ".join(f"{p}={s:.2f}" for p, s in e.get_shares().items())
+            yield [
+                e.id,
+                e.description,
+                f"{e.amount:.2f}",
+                e.currency,
+                e.paid_by,
+                "; ".join(e.involved_people),
+                e.split_mode,
+                shares,
+                e.date,
+            ]
+    elif section == "payments":
+        yield ["ID", "Description", "Amount", "Currency", "From", "To", "Date"]
+        for p in context["payments"]:
+            yield [p.id, p.description, f"{p.amount:.2f}", p.currency, p.payer, p.payee, p.date]
+    elif section == "balances":
+        yield ["Person", f"Balance ({currency})"]
+        for person, amount in context["balances"].items():
+            yield [person, f"{amount:.2f}"]
+    elif section == "settlements":
+        yield ["From", "To", f"Amount ({currency})"]
+        for s in context["settlements"]:
+            yield [s["from"], s["to"], f"{s['amount']:.2f}"]
+    elif section == "net_expense":
+        yield ["Person", f"Net Expense ({currency})"]
+        for person, amount in context["net_expense_by_person"].items():
+            yield [person, f"{amount:.2f}"]
+    else:
+        raise ValueError(f"Unknown report section '{section}'.")
+
+
+def export_section(filename, section, context, delimiter=","):
+    """Writes one report section as CSV/TSV, a row at a time."""
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        for row in _section_rows(section, context):
+            writer.writerow(row)
+
+
+def export_delimited(base_filename, context, sections=SECTIONS, delimiter=","):
+    """Writes each section to ``<base>_<section>.csv`` (or ``.tsv``).
+
+    Returns the list of files written.
+    """
+    extension = "tsv" if delimiter == "\t" else "csv"
+    base, _ = os.path.splitext(base_filename)
+    written = []
+    for section in sections:
+        filename = f"{base}_{section}.{extension}"
+        export_section(filename, section, context, delimiter)
+        written.append(filename)
+    return written
+
+
+def export_html(filename, context):
+    """Renders the report template to a standalone HTML file, streaming chunks."""
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    template = get_report_template()
+    with open(filename, "w", encoding="utf-8") as f:
+        for chunk in template.generate(context):
+            f.write(chunk)
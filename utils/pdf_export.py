@@ -1,8 +1,16 @@
-from jinja2 import Environment, FileSystemLoader
 import os
-from datetime import datetime
+import shutil
 import pdfkit
 
+from core.currency import DEFAULT_CURRENCY
+from utils.report import (
+    TEMPLATE_DIR,
+    TEMPLATE_NAME,
+    build_report_context,
+    get_report_template,
+)
+from utils.report_cache import ReportCache, report_fingerprint
+
 # Configure path to wkhtmltopdf executable
 # IMPORTANT: You need to install wkhtmltopdf separately.
 # Download from https://wkhtmltopdf.org/downloads.html
@@ -19,55 +27,71 @@ if not os.path.exists(WKHTMLTOPDF_PATH):
 else:
     config = pdfkit.configuration(wkhtmltopdf=WKHTMLTOPDF_PATH)
 
-def format_date(dt):
-    if isinstance(dt, str):
-        try:
-            for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S.%f"):
-                try:
-                    dt = datetime.strptime(dt, fmt)
-                    break
-                except ValueError:
-                    continue
-        except Exception:
-            return str(dt)
-    if isinstance(dt, datetime):
-        return dt.strftime("%b %d, %Y, %I:%M %p")
-    return str(dt)
+def report_cache_key(people, expenses, payments, currency=DEFAULT_CURRENCY, rates=None):
+    """Cache key for a report; needs no balances or settlements."""
+    return report_fingerprint(
+        people,
+        expenses,
+        payments,
+        currency,
+        os.path.join(TEMPLATE_DIR, TEMPLATE_NAME),
+        rates.data_manager.filepath if rates else None,
+    )
 
 
-def export_summary_to_pdf(filename, people, expenses, payments, balances, settlements):
+def copy_cached_pdf(filename, key, cache=None):
+    """Copies the cached PDF for key to filename; returns True on a hit."""
+    cache = cache or ReportCache()
+    cached_pdf = cache.get(key, "pdf")
+    if not cached_pdf:
+        return False
     os.makedirs(os.path.dirname(filename), exist_ok=True)
+    shutil.copyfile(cached_pdf, filename)
+    return True
 
-    # Setup Jinja2 environment
-    template_dir = os.path.join(os.path.dirname(__file__))
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("pdf_report_template.html")
 
-    # Prepare data for the template
-    total_expenses = sum(getattr(e, "amount", 0) for e in expenses)
-    net_expense_by_person = {p: 0 for p in people}
-    for e in expenses:
-        split = getattr(e, "split_amount_per_person", 0)
-        for person in getattr(e, "involved_people", []):
-            net_expense_by_person[person] = net_expense_by_person.get(person, 0) + split
+def export_summary_to_pdf(
+    filename,
+    people,
+    expenses,
+    payments,
+    balances,
+    settlements,
+    currency=DEFAULT_CURRENCY,
+    rates=None,
+    use_cache=True,
+    cache=None,
+    cache_key=None,
+):
+    """Writes the PDF report; returns True if it was served from the cache.
 
-    # Sort net expenses for consistent output
-    sorted_net_expense_by_person = dict(sorted(net_expense_by_person.items(), key=lambda x: x[1], reverse=True))
+    With use_cache=False nothing is read from the cache, but the fresh
+    HTML and PDF are still stored. Pass cache_key when the PDF was already
+    looked up with copy_cached_pdf(); only the cached HTML is tried then.
+    """
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-    context = {
-        "generated_date": datetime.now().strftime("%B %d, %Y"),
-        "people": people,
-        "expenses": expenses,
-        "payments": payments,
-        "balances": balances,
-        "settlements": settlements,
-        "total_expenses": total_expenses,
-        "net_expense_by_person": sorted_net_expense_by_person,
-        "format_date": format_date, # Pass the function to the template
-    }
+    cache = cache or ReportCache()
+    key = cache_key or report_cache_key(people, expenses, payments, currency, rates)
+    html_out = None
+    if use_cache:
+        if cache_key is None and copy_cached_pdf(filename, key, cache):
+            return True
+        # A previous run may have rendered the HTML but failed at the PDF step
+        cached_html = cache.get(key, "html")
+        if cached_html:
+            with open(cached_html, "r", encoding="utf-8") as f:
+                html_out = f.read()
 
-    # Render HTML
-    html_out = template.render(context)
+    if html_out is None:
+        template = get_report_template()
+        context = build_report_context(
+            people, expenses, payments, balances, settlements, currency, rates
+        )
+
+        # Render HTML
+        html_out = template.render(context)
+        cache.put_text(key, "html", html_out)
 
     # Generate PDF using pdfkit
     # Options for pdfkit can be added here if needed, e.g., for header/footer
@@ -80,3 +104,8 @@ def export_summary_to_pdf(filename, people, expenses, payments, balances, settle
     except Exception as e:
         print(f"Error generating PDF: {e}")
         print("Please ensure wkhtmltopdf is installed and its path is correctly configured.")
+        return False
+
+    if os.path.exists(filename):
+        cache.put_file(key, "pdf", filename)
+    return False
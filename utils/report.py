@@ -0,0 +1,66 @@
+from jinja2 import Environment, FileSystemLoader
+import os
+from datetime import datetime
+
+from core.calculator import ExpenseCalculator
+from core.currency import DEFAULT_CURRENCY, format_money
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_NAME = "pdf_report_template.html"
+
+
+def format_date(dt):
+    if isinstance(dt, str):
+        try:
+            for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S.%f"):
+                try:
+                    dt = datetime.strptime(dt, fmt)
+                    break
+                except ValueError:
+                    continue
+        except Exception:
+            return str(dt)
+    if isinstance(dt, datetime):
+        return dt.strftime("%b %d, %Y, %I:%M %p")
+    return str(dt)
+
+
+def get_report_template():
+    """Loads the Jinja2 report template shared by all export formats."""
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+    return env.get_template(TEMPLATE_NAME)
+
+
+def build_report_context(
+    people,
+    expenses,
+    payments,
+    balances,
+    settlements,
+    currency=DEFAULT_CURRENCY,
+    rates=None,
+):
+    """Prepares the report data used by the PDF, HTML and CSV/TSV exports."""
+    # Convert stats into the settlement currency
+    net_expense_by_person = {p: 0 for p in people}
+    net_expense_by_person.update(
+        ExpenseCalculator().calculate_owed(expenses, currency, rates)
+    )
+    total_expenses = sum(net_expense_by_person.values())
+
+    # Sort net expenses for consistent output
+    sorted_net_expense_by_person = dict(sorted(net_expense_by_person.items(), key=lambda x: x[1], reverse=True))
+
+    return {
+        "generated_date": datetime.now().strftime("%B %d, %Y"),
+        "people": people,
+        "expenses": expenses,
+        "payments": payments,
+        "balances": balances,
+        "settlements": settlements,
+        "total_expenses": total_expenses,
+        "net_expense_by_person": sorted_net_expense_by_person,
+        "currency": currency,
+        "format_date": format_date, # Pass the function to the template
+        "money": format_money,
+    }
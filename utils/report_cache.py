@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Optional
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data", "report_cache"
+)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def _mtime(path: Optional[str]) -> Optional[float]:
+    try:
+        return os.path.getmtime(path) if path else None
+    except OSError:
+        return None
+
+
+def report_fingerprint(people, expenses, payments, currency, template_path, rates_path=None) -> str:
+    """Cheap content fingerprint of a report's inputs.
+
+    Records are append-only with increasing IDs, so the high-water IDs and
+    counts stand in for the ledger contents without hashing every row.
+    """
+    parts = {
+        "people": len(people),
+        "expenses": [len(expenses), max((e.id for e in expenses), default=0)],
+        "payments": [len(payments), max((p.id for p in payments), default=0)],
+        "currency": currency,
+        "template": _mtime(template_path),
+        "rates": _mtime(rates_path),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """Directory of rendered reports with size-bounded LRU eviction.
+
+    Files are named ``<fingerprint>.<ext>``; a file's mtime is bumped on
+    every hit, so the oldest mtime is always the least recently used.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{ext}")
+
+    def get(self, key: str, ext: str) -> Optional[str]:
+        """Returns the cached file path for a key, or None on a miss."""
+        path = self._path(key, ext)
+        if not os.path.exists(path):
+            return None
+        os.utime(path, None)
+        return path
+
+    def put_file(self, key: str, ext: str, src_path: str) -> str:
+        path = self._path(key, ext)
+        shutil.copyfile(src_path, path)
+        self._evict()
+        return path
+
+    def put_text(self, key: str, ext: str, text: str) -> str:
+        path = self._path(key, ext)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        self._evict()
+        return path
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size